@@ -8,10 +8,17 @@ base_path = os.path.abspath(os.path.dirname(__file__))
 PyInstaller.__main__.run([
     'link_shell.py',  # 主程序文件
     '--name=LinkShellExtension',  # 生成的exe名称
-    '--onefile',  # 打包成单个exe文件
+    '--onedir',  # 打包成目录，避免每次启动都解压到临时目录
     '--windowed',  # 使用Windows子系统
     '--uac-admin',  # 请求管理员权限
     '--icon=NONE',  # 默认图标
+    # 排除未使用的标准库模块，减小打包体积
+    '--exclude-module=tkinter.font',
+    '--exclude-module=unittest',
+    '--exclude-module=pydoc',
+    '--exclude-module=email',
+    '--exclude-module=http',
+    '--exclude-module=xml',
     f'--distpath={os.path.join(base_path, "dist")}',  # 输出目录
     f'--workpath={os.path.join(base_path, "build")}',  # 临时工作目录
     '--clean',  # 清理临时文件
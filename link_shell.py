@@ -9,46 +9,348 @@ Python Link Shell Extension
 import os
 import sys
 import ctypes
+from ctypes import wintypes
 import argparse
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from tkinter.font import Font
-import winreg
+import threading
 import subprocess
-from pathlib import Path
+import winreg
+
+# 脚本路径在运行期间不变，导入时解析一次
+_SCRIPT_PATH = os.path.abspath(__file__)
+
+# Win32 API 常量
+INVALID_FILE_ATTRIBUTES = 0xFFFFFFFF
+FILE_ATTRIBUTE_DIRECTORY = 0x10
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+GENERIC_WRITE = 0x40000000
+FILE_SHARE_READ = 0x1
+FILE_SHARE_WRITE = 0x2
+FILE_SHARE_DELETE = 0x4
+OPEN_EXISTING = 3
+FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+FILE_FLAG_OPEN_REPARSE_POINT = 0x00200000
+INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+FSCTL_SET_REPARSE_POINT = 0x900A4
+FSCTL_GET_REPARSE_POINT = 0x900A8
+IO_REPARSE_TAG_MOUNT_POINT = 0xA0000003
+IO_REPARSE_TAG_SYMLINK = 0xA000000C
+
+class REPARSE_DATA_BUFFER(ctypes.Structure):
+    # 符号链接与目录联接共用的头部，符号链接的PathBuffer前还有4字节Flags
+    _fields_ = [
+        ("ReparseTag", wintypes.DWORD),
+        ("ReparseDataLength", wintypes.USHORT),
+        ("Reserved", wintypes.USHORT),
+        ("SubstituteNameOffset", wintypes.USHORT),
+        ("SubstituteNameLength", wintypes.USHORT),
+        ("PrintNameOffset", wintypes.USHORT),
+        ("PrintNameLength", wintypes.USHORT),
+        ("PathBuffer", ctypes.c_ubyte * 0x3FF0),
+    ]
+
+class BY_HANDLE_FILE_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ("dwFileAttributes", wintypes.DWORD),
+        ("ftCreationTime", wintypes.FILETIME),
+        ("ftLastAccessTime", wintypes.FILETIME),
+        ("ftLastWriteTime", wintypes.FILETIME),
+        ("dwVolumeSerialNumber", wintypes.DWORD),
+        ("nFileSizeHigh", wintypes.DWORD),
+        ("nFileSizeLow", wintypes.DWORD),
+        ("nNumberOfLinks", wintypes.DWORD),
+        ("nFileIndexHigh", wintypes.DWORD),
+        ("nFileIndexLow", wintypes.DWORD),
+    ]
+
+# Win32 API 函数原型
+kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+kernel32.GetFileAttributesW.argtypes = [wintypes.LPCWSTR]
+kernel32.GetFileAttributesW.restype = wintypes.DWORD
+
+kernel32.CreateFileW.argtypes = [
+    wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+    wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE,
+]
+kernel32.CreateFileW.restype = wintypes.HANDLE
+
+kernel32.DeviceIoControl.argtypes = [
+    wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID, wintypes.DWORD,
+    wintypes.LPVOID, wintypes.DWORD, wintypes.LPDWORD, wintypes.LPVOID,
+]
+kernel32.DeviceIoControl.restype = wintypes.BOOL
+
+kernel32.GetFileInformationByHandle.argtypes = [
+    wintypes.HANDLE, ctypes.POINTER(BY_HANDLE_FILE_INFORMATION),
+]
+kernel32.GetFileInformationByHandle.restype = wintypes.BOOL
+
+kernel32.CreateHardLinkW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.LPVOID]
+kernel32.CreateHardLinkW.restype = wintypes.BOOL
+
+kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+kernel32.CloseHandle.restype = wintypes.BOOL
+
+ktmw32 = ctypes.WinDLL("ktmw32", use_last_error=True)
+
+ktmw32.CreateTransaction.argtypes = [
+    wintypes.LPVOID, wintypes.LPVOID, wintypes.DWORD, wintypes.DWORD,
+    wintypes.DWORD, wintypes.DWORD, wintypes.LPWSTR,
+]
+ktmw32.CreateTransaction.restype = wintypes.HANDLE
+
+ktmw32.CommitTransaction.argtypes = [wintypes.HANDLE]
+ktmw32.CommitTransaction.restype = wintypes.BOOL
+
+ktmw32.RollbackTransaction.argtypes = [wintypes.HANDLE]
+ktmw32.RollbackTransaction.restype = wintypes.BOOL
+
+advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+
+advapi32.RegCreateKeyTransactedW.argtypes = [
+    wintypes.HKEY, wintypes.LPCWSTR, wintypes.DWORD, wintypes.LPWSTR, wintypes.DWORD,
+    wintypes.DWORD, wintypes.LPVOID, ctypes.POINTER(wintypes.HKEY), wintypes.LPDWORD,
+    wintypes.HANDLE, wintypes.LPVOID,
+]
+advapi32.RegCreateKeyTransactedW.restype = wintypes.LONG
+
+advapi32.RegSetValueExW.argtypes = [
+    wintypes.HKEY, wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD,
+    wintypes.LPCVOID, wintypes.DWORD,
+]
+advapi32.RegSetValueExW.restype = wintypes.LONG
+
+advapi32.RegDeleteKeyTransactedW.argtypes = [
+    wintypes.HKEY, wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD,
+    wintypes.HANDLE, wintypes.LPVOID,
+]
+advapi32.RegDeleteKeyTransactedW.restype = wintypes.LONG
+
+advapi32.RegCloseKey.argtypes = [wintypes.HKEY]
+advapi32.RegCloseKey.restype = wintypes.LONG
+
+SEE_MASK_NOCLOSEPROCESS = 0x40
+SEE_MASK_NO_CONSOLE = 0x8000
+SW_SHOWNORMAL = 1
+
+class SHELLEXECUTEINFOW(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.DWORD),
+        ("fMask", wintypes.ULONG),
+        ("hwnd", wintypes.HWND),
+        ("lpVerb", wintypes.LPCWSTR),
+        ("lpFile", wintypes.LPCWSTR),
+        ("lpParameters", wintypes.LPCWSTR),
+        ("lpDirectory", wintypes.LPCWSTR),
+        ("nShow", ctypes.c_int),
+        ("hInstApp", wintypes.HINSTANCE),
+        ("lpIDList", wintypes.LPVOID),
+        ("lpClass", wintypes.LPCWSTR),
+        ("hkeyClass", wintypes.HKEY),
+        ("dwHotKey", wintypes.DWORD),
+        ("hIconOrMonitor", wintypes.HANDLE),
+        ("hProcess", wintypes.HANDLE),
+    ]
+
+shell32 = ctypes.WinDLL("shell32", use_last_error=True)
+
+shell32.ShellExecuteExW.argtypes = [ctypes.POINTER(SHELLEXECUTEINFOW)]
+shell32.ShellExecuteExW.restype = wintypes.BOOL
+
+def _attrs(path):
+    """
+    获取文件属性
+    :param path: 路径
+    :return: 属性位或None(路径不存在)
+    """
+    attrs = kernel32.GetFileAttributesW(path)
+    return None if attrs == INVALID_FILE_ATTRIBUTES else attrs
+
+def _open_handle(path, access, flags):
+    handle = kernel32.CreateFileW(
+        path, access, FILE_SHARE_READ | FILE_SHARE_WRITE | FILE_SHARE_DELETE,
+        None, OPEN_EXISTING, flags, None
+    )
+    if handle == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return handle
+
+def _get_file_information(path):
+    """
+    获取文件信息，硬链接数取自nNumberOfLinks
+    :param path: 路径
+    :return: BY_HANDLE_FILE_INFORMATION
+    """
+    # 访问权限为0只读取元数据，文件被其他进程占用时也能打开
+    handle = _open_handle(path, 0, FILE_FLAG_BACKUP_SEMANTICS)
+    try:
+        info = BY_HANDLE_FILE_INFORMATION()
+        if not kernel32.GetFileInformationByHandle(handle, ctypes.byref(info)):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return info
+    finally:
+        kernel32.CloseHandle(handle)
+
+def _read_reparse_point(path):
+    handle = _open_handle(path, 0, FILE_FLAG_OPEN_REPARSE_POINT | FILE_FLAG_BACKUP_SEMANTICS)
+    try:
+        buf = REPARSE_DATA_BUFFER()
+        returned = wintypes.DWORD()
+        if not kernel32.DeviceIoControl(handle, FSCTL_GET_REPARSE_POINT, None, 0,
+                                        ctypes.byref(buf), ctypes.sizeof(buf),
+                                        ctypes.byref(returned), None):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return buf
+    finally:
+        kernel32.CloseHandle(handle)
+
+def _write_mount_point(path, source):
+    # 目录联接的PathBuffer依次存放替代名称和显示名称，均以NUL结尾
+    substitute_name = ("\\??\\" + source).encode("utf-16-le")
+    print_name = source.encode("utf-16-le")
+    path_buffer = substitute_name + b"\0\0" + print_name + b"\0\0"
+
+    buf = REPARSE_DATA_BUFFER()
+    if len(path_buffer) > ctypes.sizeof(buf.PathBuffer):
+        raise ValueError("源路径过长")
+    buf.ReparseTag = IO_REPARSE_TAG_MOUNT_POINT
+    buf.ReparseDataLength = 8 + len(path_buffer)
+    buf.SubstituteNameOffset = 0
+    buf.SubstituteNameLength = len(substitute_name)
+    buf.PrintNameOffset = len(substitute_name) + 2
+    buf.PrintNameLength = len(print_name)
+    ctypes.memmove(buf.PathBuffer, path_buffer, len(path_buffer))
+
+    handle = _open_handle(path, GENERIC_WRITE, FILE_FLAG_OPEN_REPARSE_POINT | FILE_FLAG_BACKUP_SEMANTICS)
+    try:
+        returned = wintypes.DWORD()
+        if not kernel32.DeviceIoControl(handle, FSCTL_SET_REPARSE_POINT,
+                                        ctypes.byref(buf), 8 + buf.ReparseDataLength,
+                                        None, 0, ctypes.byref(returned), None):
+            raise ctypes.WinError(ctypes.get_last_error())
+    finally:
+        kernel32.CloseHandle(handle)
+
+# 注册表事务操作
+def _check_status(status):
+    if status != 0:
+        raise ctypes.WinError(status)
+
+def _create_transaction():
+    transaction = ktmw32.CreateTransaction(None, None, 0, 0, 0, 0, None)
+    if transaction == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return transaction
+
+def _finish_transaction(transaction, operation):
+    # 执行operation后一次性提交，失败时回滚，避免留下写了一半的注册表项
+    try:
+        operation(transaction)
+        if not ktmw32.CommitTransaction(transaction):
+            raise ctypes.WinError(ctypes.get_last_error())
+    except Exception:
+        ktmw32.RollbackTransaction(transaction)
+        raise
+    finally:
+        kernel32.CloseHandle(transaction)
+
+def _write_registry_keys(root, keys):
+    """
+    在一个事务中创建注册表项并写入字符串值
+    :param root: 根键
+    :param keys: (子键路径, {值名称: 值}) 列表
+    """
+    def operation(transaction):
+        for sub_key, values in keys:
+            key = wintypes.HKEY()
+            _check_status(advapi32.RegCreateKeyTransactedW(
+                root, sub_key, 0, None, 0, winreg.KEY_SET_VALUE, None,
+                ctypes.byref(key), None, transaction, None
+            ))
+            try:
+                for name, value in values.items():
+                    data = ctypes.create_unicode_buffer(value)
+                    _check_status(advapi32.RegSetValueExW(
+                        key, name, 0, winreg.REG_SZ, data, ctypes.sizeof(data)
+                    ))
+            finally:
+                advapi32.RegCloseKey(key)
+
+    _finish_transaction(_create_transaction(), operation)
+
+def _delete_registry_keys(root, sub_keys):
+    """
+    在一个事务中按顺序删除注册表项
+    :param root: 根键
+    :param sub_keys: 子键路径列表，子项须排在父项之前
+    """
+    def operation(transaction):
+        for sub_key in sub_keys:
+            _check_status(advapi32.RegDeleteKeyTransactedW(root, sub_key, 0, 0, transaction, None))
+
+    _finish_transaction(_create_transaction(), operation)
 
 # 确保以管理员权限运行
+# 进程的管理员权限在运行期间不会改变，只需查询一次
+_IS_ADMIN = None
+
 def is_admin():
-    try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except:
-        return False
+    global _IS_ADMIN
+    if _IS_ADMIN is None:
+        try:
+            _IS_ADMIN = bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except:
+            _IS_ADMIN = False
+    return _IS_ADMIN
 
 def run_as_admin():
-    if not is_admin():
-        ctypes.windll.shell32.ShellExecuteW(
-            None, "runas", sys.executable, " ".join(sys.argv), None, 1
-        )
-        sys.exit(0)
+    """
+    以管理员权限重新启动当前程序，启动成功后退出当前进程
+    :return: 用户拒绝UAC或启动失败时返回False
+    """
+    if is_admin():
+        return True
+    
+    # 打包后的exe中sys.argv[0]就是sys.executable，不能重复传入；
+    # 以脚本运行时改用脚本绝对路径，提权后的进程工作目录可能不同
+    if getattr(sys, "frozen", False):
+        argv = sys.argv[1:]
+    else:
+        argv = [_SCRIPT_PATH] + sys.argv[1:]
+    
+    info = SHELLEXECUTEINFOW()
+    info.cbSize = ctypes.sizeof(info)
+    info.fMask = SEE_MASK_NOCLOSEPROCESS | SEE_MASK_NO_CONSOLE
+    info.lpVerb = "runas"
+    info.lpFile = sys.executable
+    info.lpParameters = subprocess.list2cmdline(argv)
+    # 保持当前工作目录，使相对的--source/--target在提权后解析结果不变
+    info.lpDirectory = os.getcwd()
+    info.nShow = SW_SHOWNORMAL
+    if not shell32.ShellExecuteExW(ctypes.byref(info)) or not info.hProcess:
+        return False
+    
+    kernel32.CloseHandle(info.hProcess)
+    sys.exit(0)
 
 # 链接操作函数
+LINK_TYPE_NAMES = {"hardlink": "硬链接", "symlink": "符号链接", "junction": "目录联接"}
+
 def create_hardlink(source, target):
     """
     创建硬链接
     :param source: 源文件路径
     :param target: 目标文件路径
-    :return: 是否成功
+    :raises ValueError: 源路径不是文件
+    :raises OSError: 创建失败
     """
-    try:
-        if os.path.isfile(source):
-            result = ctypes.windll.kernel32.CreateHardLinkW(target, source, None)
-            return result != 0
-        else:
-            messagebox.showerror("错误", "硬链接只能用于文件，不能用于目录")
-            return False
-    except Exception as e:
-        messagebox.showerror("错误", f"创建硬链接失败: {str(e)}")
-        return False
+    attrs = _attrs(source)
+    if attrs is None:
+        raise FileNotFoundError("源路径不存在")
+    if attrs & FILE_ATTRIBUTE_DIRECTORY:
+        raise ValueError("硬链接只能用于文件，不能用于目录")
+    if not kernel32.CreateHardLinkW(target, source, None):
+        raise ctypes.WinError(ctypes.get_last_error())
 
 def create_symlink(source, target, is_directory=False):
     """
@@ -56,71 +358,79 @@ def create_symlink(source, target, is_directory=False):
     :param source: 源路径
     :param target: 目标路径
     :param is_directory: 是否是目录
-    :return: 是否成功
+    :raises OSError: 创建失败
     """
-    try:
-        if is_directory:
-            os.symlink(source, target, target_is_directory=True)
-        else:
-            os.symlink(source, target)
-        return True
-    except Exception as e:
-        messagebox.showerror("错误", f"创建符号链接失败: {str(e)}")
-        return False
+    if is_directory:
+        os.symlink(source, target, target_is_directory=True)
+    else:
+        os.symlink(source, target)
 
 def create_junction(source, target):
     """
     创建目录联接
     :param source: 源目录路径
     :param target: 目标目录路径
-    :return: 是否成功
+    :raises ValueError: 源路径不是目录
+    :raises OSError: 创建失败
     """
+    attrs = _attrs(source)
+    if attrs is None:
+        raise FileNotFoundError("源路径不存在")
+    if not attrs & FILE_ATTRIBUTE_DIRECTORY:
+        raise ValueError("目录联接只能用于目录，不能用于文件")
+    
+    # 创建空目录并写入挂载点重解析数据，写入失败时删除该目录
+    os.mkdir(target)
     try:
-        if os.path.isdir(source):
-            # 使用mklink /J命令创建目录联接
-            result = subprocess.run(
-                ["cmd", "/c", f"mklink /J \"{target}\" \"{source}\""], 
-                capture_output=True, 
-                text=True, 
-                shell=True
-            )
-            return result.returncode == 0
-        else:
-            messagebox.showerror("错误", "目录联接只能用于目录，不能用于文件")
-            return False
-    except Exception as e:
-        messagebox.showerror("错误", f"创建目录联接失败: {str(e)}")
-        return False
+        _write_mount_point(target, os.path.abspath(source))
+    except Exception:
+        os.rmdir(target)
+        raise
+
+def create_link_by_type(link_type, source, target):
+    """
+    按类型创建链接，源路径预先解析为绝对路径，避免符号链接相对目标目录解析
+    :param link_type: 链接类型 hardlink/symlink/junction
+    :param source: 源路径
+    :param target: 目标路径
+    :raises ValueError: 源路径类型不符
+    :raises OSError: 创建失败
+    """
+    source = os.path.abspath(source)
+    if link_type == "hardlink":
+        create_hardlink(source, target)
+    elif link_type == "symlink":
+        attrs = _attrs(source)
+        is_dir = attrs is not None and bool(attrs & FILE_ATTRIBUTE_DIRECTORY)
+        create_symlink(source, target, is_dir)
+    elif link_type == "junction":
+        create_junction(source, target)
 
 # 检查路径是否是链接
-def is_link(path):
+def is_link(path, check_hardlink=False):
     """
     检查路径是否是链接
     :param path: 要检查的路径
+    :param check_hardlink: 是否检查硬链接，需要额外打开文件
     :return: 链接类型或None
     """
     try:
-        if os.path.islink(path):
-            return "符号链接"
-        
-        # 检查是否是目录联接
-        if os.path.isdir(path):
-            result = subprocess.run(
-                ["fsutil", "reparsepoint", "query", path], 
-                capture_output=True, 
-                text=True
-            )
-            if "重解析点" in result.stdout or "Reparse" in result.stdout:
+        attrs = _attrs(path)
+        if attrs is None:
+            return None
+        
+        # 符号链接和目录联接都是重解析点，由重解析标记区分
+        if attrs & FILE_ATTRIBUTE_REPARSE_POINT:
+            tag = _read_reparse_point(path).ReparseTag
+            if tag == IO_REPARSE_TAG_SYMLINK:
+                return "符号链接"
+            if tag == IO_REPARSE_TAG_MOUNT_POINT:
                 return "目录联接"
+            return None
         
         # 检查是否是硬链接
-        if os.path.isfile(path):
-            result = subprocess.run(
-                ["fsutil", "hardlink", "list", path], 
-                capture_output=True, 
-                text=True
-            )
-            if len(result.stdout.strip().split('\n')) > 2:
+        if check_hardlink and not attrs & FILE_ATTRIBUTE_DIRECTORY:
+            if _get_file_information(path).nNumberOfLinks > 1:
                 return "硬链接"
         
         return None
@@ -135,311 +445,407 @@ def get_link_target(path):
     :return: 目标路径或None
     """
     try:
-        if os.path.islink(path):
-            return os.readlink(path)
-        
-        # 获取目录联接的目标
-        if os.path.isdir(path):
-            result = subprocess.run(
-                ["fsutil", "reparsepoint", "query", path], 
-                capture_output=True, 
-                text=True
-            )
-            for line in result.stdout.split('\n'):
-                if "Substitute Name" in line or "替代名称" in line:
-                    target = line.split(':')[-1].strip()
-                    # 处理输出格式，移除可能的前缀
-                    if target.startswith("\\??\\"): 
-                        target = target[4:]
-                    return target
-        
-        return None
+        attrs = _attrs(path)
+        if attrs is None or not attrs & FILE_ATTRIBUTE_REPARSE_POINT:
+            return None
+        
+        buf = _read_reparse_point(path)
+        if buf.ReparseTag == IO_REPARSE_TAG_SYMLINK:
+            offset = 4 + buf.SubstituteNameOffset
+        elif buf.ReparseTag == IO_REPARSE_TAG_MOUNT_POINT:
+            offset = buf.SubstituteNameOffset
+        else:
+            return None
+        
+        target = bytes(buf.PathBuffer)[offset:offset + buf.SubstituteNameLength].decode("utf-16-le")
+        # 将NT路径前缀转换为Win32路径，与os.readlink的处理一致
+        if target.startswith("\\??\\UNC\\"):
+            target = "\\\\" + target[8:]
+        elif target.startswith("\\??\\"):
+            target = target[4:]
+            # 卷GUID等非盘符路径改用\\?\前缀，否则会被当作相对路径
+            if target[1:3] != ":\\":
+                target = "\\\\?\\" + target
+        return target
     except:
         return None
 
-# 图形界面类
-class LinkShellApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        
-        self.title("Python Link Shell Extension")
-        self.geometry("700x500")
-        self.resizable(True, True)
+# 启动图形界面，仅在此时导入tkinter，命令行模式无需加载
+def _launch_gui(prefill=None):
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox
+    
+    # 图形界面类
+    class LinkShellApp(tk.Tk):
+        def __init__(self):
+            super().__init__()
+        
+            self.title("Python Link Shell Extension")
+            self.geometry("700x500")
+            self.resizable(True, True)
+        
+            # 右键菜单集成状态缓存，只在修改注册表后更新
+            self._integration_cache = None
+        
+            # 设置样式
+            self.style = ttk.Style()
+            self.style.theme_use('clam')
+        
+            # 创建主框架
+            self.main_frame = ttk.Frame(self)
+            self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+            # 创建选项卡
+            self.notebook = ttk.Notebook(self.main_frame)
+            self.notebook.pack(fill=tk.BOTH, expand=True)
+        
+            # 创建链接选项卡
+            self.create_tab = ttk.Frame(self.notebook)
+            self.notebook.add(self.create_tab, text="创建链接")
+        
+            # 创建管理选项卡
+            self.manage_tab = ttk.Frame(self.notebook)
+            self.notebook.add(self.manage_tab, text="管理链接")
+        
+            # 创建设置选项卡
+            self.settings_tab = ttk.Frame(self.notebook)
+            self.notebook.add(self.settings_tab, text="设置")
+        
+            # 各选项卡在首次选中时才初始化内容，默认显示的创建链接选项卡立即初始化
+            self._tab_builders = {
+                str(self.create_tab): self.init_create_tab,
+                str(self.manage_tab): self.init_manage_tab,
+                str(self.settings_tab): self.init_settings_tab,
+            }
+            self._built = set()
+            self._build_tab(self.create_tab)
+            self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        
+            # 状态栏
+            self.status_var = tk.StringVar()
+            self.status_var.set("就绪")
+            self.status_bar = ttk.Label(self, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
+            self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+    
+        def _on_tab_changed(self, event):
+            tab = str(self.notebook.select())
+            # 再次切换到设置选项卡时按缓存刷新集成状态，丢弃未应用的勾选
+            if tab == str(self.settings_tab) and tab in self._built:
+                self.integrate_var.set(self.check_integration())
+            self._build_tab(tab)
+    
+        def _build_tab(self, tab):
+            tab = str(tab)
+            if tab not in self._built:
+                self._built.add(tab)
+                self._tab_builders[tab]()
+    
+        def init_create_tab(self):
+            # 链接类型选择
+            ttk.Label(self.create_tab, text="链接类型:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
         
-        # 设置样式
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
+            self.link_type = tk.StringVar()
+            self.link_type.set("hardlink")
         
-        # 创建主框架
-        self.main_frame = ttk.Frame(self)
-        self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            ttk.Radiobutton(self.create_tab, text="硬链接 (仅文件)", variable=self.link_type, 
+                           value="hardlink").grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
+            ttk.Radiobutton(self.create_tab, text="符号链接", variable=self.link_type, 
+                           value="symlink").grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
+            ttk.Radiobutton(self.create_tab, text="目录联接 (仅目录)", variable=self.link_type, 
+                           value="junction").grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
         
-        # 创建选项卡
-        self.notebook = ttk.Notebook(self.main_frame)
-        self.notebook.pack(fill=tk.BOTH, expand=True)
+            # 源路径选择
+            ttk.Label(self.create_tab, text="源路径:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=5)
         
-        # 创建链接选项卡
-        self.create_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.create_tab, text="创建链接")
+            self.source_path = tk.StringVar()
+            source_entry = ttk.Entry(self.create_tab, textvariable=self.source_path, width=50)
+            source_entry.grid(row=3, column=1, sticky=tk.W+tk.E, padx=5, pady=5)
         
-        # 创建管理选项卡
-        self.manage_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.manage_tab, text="管理链接")
+            ttk.Button(self.create_tab, text="浏览...", command=self.browse_source).grid(
+                row=3, column=2, sticky=tk.W, padx=5, pady=5)
         
-        # 创建设置选项卡
-        self.settings_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.settings_tab, text="设置")
+            # 目标路径选择
+            ttk.Label(self.create_tab, text="目标路径:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=5)
         
-        # 初始化各选项卡的内容
-        self.init_create_tab()
-        self.init_manage_tab()
-        self.init_settings_tab()
+            self.target_path = tk.StringVar()
+            target_entry = ttk.Entry(self.create_tab, textvariable=self.target_path, width=50)
+            target_entry.grid(row=4, column=1, sticky=tk.W+tk.E, padx=5, pady=5)
         
-        # 状态栏
-        self.status_var = tk.StringVar()
-        self.status_var.set("就绪")
-        self.status_bar = ttk.Label(self, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-    
-    def init_create_tab(self):
-        # 链接类型选择
-        ttk.Label(self.create_tab, text="链接类型:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+            ttk.Button(self.create_tab, text="浏览...", command=self.browse_target).grid(
+                row=4, column=2, sticky=tk.W, padx=5, pady=5)
         
-        self.link_type = tk.StringVar()
-        self.link_type.set("hardlink")
-        
-        ttk.Radiobutton(self.create_tab, text="硬链接 (仅文件)", variable=self.link_type, 
-                       value="hardlink").grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
-        ttk.Radiobutton(self.create_tab, text="符号链接", variable=self.link_type, 
-                       value="symlink").grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
-        ttk.Radiobutton(self.create_tab, text="目录联接 (仅目录)", variable=self.link_type, 
-                       value="junction").grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
-        
-        # 源路径选择
-        ttk.Label(self.create_tab, text="源路径:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=5)
-        
-        self.source_path = tk.StringVar()
-        source_entry = ttk.Entry(self.create_tab, textvariable=self.source_path, width=50)
-        source_entry.grid(row=3, column=1, sticky=tk.W+tk.E, padx=5, pady=5)
-        
-        ttk.Button(self.create_tab, text="浏览...", command=self.browse_source).grid(
-            row=3, column=2, sticky=tk.W, padx=5, pady=5)
-        
-        # 目标路径选择
-        ttk.Label(self.create_tab, text="目标路径:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=5)
-        
-        self.target_path = tk.StringVar()
-        target_entry = ttk.Entry(self.create_tab, textvariable=self.target_path, width=50)
-        target_entry.grid(row=4, column=1, sticky=tk.W+tk.E, padx=5, pady=5)
-        
-        ttk.Button(self.create_tab, text="浏览...", command=self.browse_target).grid(
-            row=4, column=2, sticky=tk.W, padx=5, pady=5)
-        
-        # 创建按钮
-        create_button = ttk.Button(self.create_tab, text="创建链接", command=self.create_link)
-        create_button.grid(row=5, column=1, pady=20)
-        
-        # 说明文本
-        info_text = "\n链接类型说明:\n\n"
-        info_text += "硬链接: 只能用于文件，不能跨驱动器，多个文件名指向同一个文件内容\n"
-        info_text += "符号链接: 可用于文件或目录，可以跨驱动器，类似快捷方式但更透明\n"
-        info_text += "目录联接: 只能用于目录，不能跨驱动器，将一个目录挂载到另一个位置\n"
-        
-        info_label = ttk.Label(self.create_tab, text=info_text, justify=tk.LEFT, wraplength=650)
-        info_label.grid(row=6, column=0, columnspan=3, sticky=tk.W, padx=5, pady=10)
-        
-        # 配置网格布局
-        self.create_tab.columnconfigure(1, weight=1)
-    
-    def init_manage_tab(self):
-        # 路径输入
-        ttk.Label(self.manage_tab, text="检查路径:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        
-        self.check_path = tk.StringVar()
-        check_entry = ttk.Entry(self.manage_tab, textvariable=self.check_path, width=50)
-        check_entry.grid(row=0, column=1, sticky=tk.W+tk.E, padx=5, pady=5)
-        
-        ttk.Button(self.manage_tab, text="浏览...", command=self.browse_check).grid(
-            row=0, column=2, sticky=tk.W, padx=5, pady=5)
+            # 创建按钮
+            self.create_button = ttk.Button(self.create_tab, text="创建链接", command=self.create_link)
+            self.create_button.grid(row=5, column=1, pady=20)
         
-        # 检查按钮
-        check_button = ttk.Button(self.manage_tab, text="检查链接", command=self.check_link)
-        check_button.grid(row=1, column=1, pady=10)
+            # 说明文本
+            info_text = "\n链接类型说明:\n\n"
+            info_text += "硬链接: 只能用于文件，不能跨驱动器，多个文件名指向同一个文件内容\n"
+            info_text += "符号链接: 可用于文件或目录，可以跨驱动器，类似快捷方式但更透明\n"
+            info_text += "目录联接: 只能用于目录，不能跨驱动器，将一个目录挂载到另一个位置\n"
         
-        # 结果显示区域
-        ttk.Label(self.manage_tab, text="链接信息:").grid(row=2, column=0, sticky=tk.NW, padx=5, pady=5)
-        
-        self.result_text = tk.Text(self.manage_tab, height=15, width=70, wrap=tk.WORD)
-        self.result_text.grid(row=2, column=1, columnspan=2, sticky=tk.W+tk.E+tk.N+tk.S, padx=5, pady=5)
-        
-        # 滚动条
-        scrollbar = ttk.Scrollbar(self.manage_tab, orient="vertical", command=self.result_text.yview)
-        scrollbar.grid(row=2, column=3, sticky=tk.NS)
-        self.result_text.configure(yscrollcommand=scrollbar.set)
-        
-        # 配置网格布局
-        self.manage_tab.columnconfigure(1, weight=1)
-        self.manage_tab.rowconfigure(2, weight=1)
-    
-    def init_settings_tab(self):
-        # 右键菜单集成选项
-        self.integrate_var = tk.BooleanVar()
-        self.integrate_var.set(self.check_integration())
+            info_label = ttk.Label(self.create_tab, text=info_text, justify=tk.LEFT, wraplength=650)
+            info_label.grid(row=6, column=0, columnspan=3, sticky=tk.W, padx=5, pady=10)
         
-        ttk.Checkbutton(self.settings_tab, text="集成到Windows资源管理器右键菜单", 
-                       variable=self.integrate_var).grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        
-        # 应用按钮
-        apply_button = ttk.Button(self.settings_tab, text="应用设置", command=self.apply_settings)
-        apply_button.grid(row=1, column=0, pady=10)
-        
-        # 说明文本
-        note_text = "\n注意: 集成到右键菜单需要管理员权限，且可能需要重启资源管理器才能生效。\n"
-        note_label = ttk.Label(self.settings_tab, text=note_text, justify=tk.LEFT, wraplength=650)
-        note_label.grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=5, pady=10)
-    
-    # 浏览文件/文件夹的方法
-    def browse_source(self):
-        path = filedialog.askdirectory() if self.link_type.get() == "junction" else filedialog.askopenfilename()
-        if path:
-            self.source_path.set(path)
-    
-    def browse_target(self):
-        if self.link_type.get() == "hardlink":
-            # 硬链接目标是文件
-            path = filedialog.asksaveasfilename()
-        else:
-            # 符号链接和目录联接目标可以是新位置
-            path = filedialog.askdirectory() if self.link_type.get() == "junction" else filedialog.asksaveasfilename()
-        if path:
-            self.target_path.set(path)
-    
-    def browse_check(self):
-        path = filedialog.askopenfilename()
-        if path:
-            self.check_path.set(path)
-    
-    # 创建链接
-    def create_link(self):
-        source = self.source_path.get()
-        target = self.target_path.get()
-        
-        if not source or not target:
-            messagebox.showerror("错误", "请指定源路径和目标路径")
-            return
-        
-        link_type = self.link_type.get()
-        
-        # 检查是否需要管理员权限
-        if link_type in ["symlink", "junction"] and not is_admin():
-            run_as_admin()
-            return
-        
-        success = False
-        if link_type == "hardlink":
-            success = create_hardlink(source, target)
-        elif link_type == "symlink":
-            is_dir = os.path.isdir(source)
-            success = create_symlink(source, target, is_dir)
-        elif link_type == "junction":
-            success = create_junction(source, target)
-        
-        if success:
-            self.status_var.set(f"成功创建{link_type}链接")
-            messagebox.showinfo("成功", f"成功创建链接: {target}")
-        else:
-            self.status_var.set("创建链接失败")
+            # 配置网格布局
+            self.create_tab.columnconfigure(1, weight=1)
     
-    # 检查链接
-    def check_link(self):
-        path = self.check_path.get()
+        def init_manage_tab(self):
+            # 路径输入
+            ttk.Label(self.manage_tab, text="检查路径:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        
+            self.check_path = tk.StringVar()
+            check_entry = ttk.Entry(self.manage_tab, textvariable=self.check_path, width=50)
+            check_entry.grid(row=0, column=1, sticky=tk.W+tk.E, padx=5, pady=5)
+        
+            ttk.Button(self.manage_tab, text="浏览...", command=self.browse_check).grid(
+                row=0, column=2, sticky=tk.W, padx=5, pady=5)
         
-        if not path:
-            messagebox.showerror("错误", "请指定要检查的路径")
-            return
+            # 检查按钮
+            self.check_button = ttk.Button(self.manage_tab, text="检查链接", command=self.check_link)
+            self.check_button.grid(row=1, column=1, pady=10)
         
-        if not os.path.exists(path):
-            messagebox.showerror("错误", "指定的路径不存在")
-            return
+            # 结果显示区域
+            ttk.Label(self.manage_tab, text="链接信息:").grid(row=2, column=0, sticky=tk.NW, padx=5, pady=5)
         
-        self.result_text.delete(1.0, tk.END)
+            self.result_text = tk.Text(self.manage_tab, height=15, width=70, wrap=tk.WORD)
+            self.result_text.grid(row=2, column=1, columnspan=2, sticky=tk.W+tk.E+tk.N+tk.S, padx=5, pady=5)
         
-        link_type = is_link(path)
-        if link_type:
-            target = get_link_target(path)
-            self.result_text.insert(tk.END, f"路径: {path}\n")
-            self.result_text.insert(tk.END, f"类型: {link_type}\n")
+            # 滚动条
+            scrollbar = ttk.Scrollbar(self.manage_tab, orient="vertical", command=self.result_text.yview)
+            scrollbar.grid(row=2, column=3, sticky=tk.NS)
+            self.result_text.configure(yscrollcommand=scrollbar.set)
+        
+            # 配置网格布局
+            self.manage_tab.columnconfigure(1, weight=1)
+            self.manage_tab.rowconfigure(2, weight=1)
+    
+        def init_settings_tab(self):
+            # 右键菜单集成选项
+            self.integrate_var = tk.BooleanVar()
+            self.integrate_var.set(self.check_integration())
+        
+            ttk.Checkbutton(self.settings_tab, text="集成到Windows资源管理器右键菜单", 
+                           variable=self.integrate_var).grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        
+            # 应用按钮
+            self.apply_button = ttk.Button(self.settings_tab, text="应用设置", command=self.apply_settings)
+            self.apply_button.grid(row=1, column=0, pady=10)
+        
+            # 说明文本
+            note_text = "\n注意: 集成到右键菜单需要管理员权限，且可能需要重启资源管理器才能生效。\n"
+            note_label = ttk.Label(self.settings_tab, text=note_text, justify=tk.LEFT, wraplength=650)
+            note_label.grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=5, pady=10)
+    
+        # 浏览文件/文件夹的方法
+        def browse_source(self):
+            path = filedialog.askdirectory() if self.link_type.get() == "junction" else filedialog.askopenfilename()
+            if path:
+                self.source_path.set(path)
+    
+        def browse_target(self):
+            if self.link_type.get() == "hardlink":
+                # 硬链接目标是文件
+                path = filedialog.asksaveasfilename()
+            else:
+                # 符号链接和目录联接目标可以是新位置
+                path = filedialog.askdirectory() if self.link_type.get() == "junction" else filedialog.asksaveasfilename()
+            if path:
+                self.target_path.set(path)
+    
+        def browse_check(self):
+            path = filedialog.askopenfilename()
+            if path:
+                self.check_path.set(path)
+    
+        # 在后台线程中执行耗时操作，避免阻塞界面主循环
+        def _run_in_background(self, button, worker, callback):
+            """
+            :param button: 执行期间禁用的按钮，防止重复触发
+            :param worker: 在后台线程中调用的函数
+            :param callback: 完成后在界面线程中以(result, error)调用的函数
+            """
+            button.config(state=tk.DISABLED)
+        
+            def run():
+                try:
+                    result, error = worker(), None
+                except Exception as e:
+                    result, error = None, e
+                # 任务完成前窗口可能已关闭，此时无需再回传结果
+                try:
+                    self.after(0, self._finish_background, button, callback, result, error)
+                except (RuntimeError, tk.TclError):
+                    pass
+        
+            threading.Thread(target=run, daemon=True).start()
+    
+        def _finish_background(self, button, callback, result, error):
+            button.config(state=tk.NORMAL)
+            callback(result, error)
+    
+        # 以管理员权限重新启动，失败时保留当前窗口继续使用
+        def _request_admin(self):
+            if not run_as_admin():
+                self.status_var.set("未获得管理员权限")
+                messagebox.showwarning("警告", "未能以管理员权限重新启动，该操作需要管理员权限")
+    
+        # 创建链接
+        def create_link(self):
+            source = self.source_path.get()
+            target = self.target_path.get()
+        
+            if not source or not target:
+                messagebox.showerror("错误", "请指定源路径和目标路径")
+                return
+        
+            link_type = self.link_type.get()
+        
+            # 检查是否需要管理员权限，目录联接和硬链接无需管理员权限
+            if link_type == "symlink" and not is_admin():
+                self._request_admin()
+                return
+        
+            self.status_var.set("正在创建链接...")
+            self._run_in_background(
+                self.create_button,
+                lambda: create_link_by_type(link_type, source, target),
+                lambda result, error: self._render_create_result(link_type, target, error)
+            )
+    
+        def _render_create_result(self, link_type, target, error):
+            if error is None:
+                self.status_var.set(f"成功创建{LINK_TYPE_NAMES[link_type]}")
+                messagebox.showinfo("成功", f"成功创建链接: {target}")
+            else:
+                self.status_var.set("创建链接失败")
+                messagebox.showerror("错误", f"创建链接失败: {str(error)}")
+    
+        # 检查链接
+        def check_link(self):
+            path = self.check_path.get()
+        
+            if not path:
+                messagebox.showerror("错误", "请指定要检查的路径")
+                return
+        
+            self.status_var.set("正在检查链接...")
+            self._run_in_background(
+                self.check_button,
+                lambda: self._check_link_worker(path),
+                lambda result, error: self._render_check_result(path, result, error)
+            )
+    
+        def _check_link_worker(self, path):
+            # 不跟随链接，失效的符号链接和目录联接也能检查
+            if _attrs(path) is None:
+                raise FileNotFoundError("指定的路径不存在")
+        
+            link_type = is_link(path, check_hardlink=True)
+            target = get_link_target(path) if link_type else None
+            target_exists = False
             if target:
-                self.result_text.insert(tk.END, f"目标: {target}\n")
-                self.result_text.insert(tk.END, f"目标存在: {'是' if os.path.exists(target) else '否'}\n")
-        else:
-            self.result_text.insert(tk.END, f"路径 {path} 不是链接")
+                # 相对符号链接的目标相对于链接所在目录，而不是当前工作目录
+                resolved = target
+                if not os.path.isabs(target):
+                    resolved = os.path.join(os.path.dirname(os.path.abspath(path)), target)
+                target_exists = _attrs(resolved) is not None
+            return link_type, target, target_exists
     
-    # 检查是否已集成到右键菜单
-    def check_integration(self):
-        try:
-            key = winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, "*\\shell\\PythonLinkShell")
-            winreg.CloseKey(key)
-            return True
-        except:
-            return False
+        def _render_check_result(self, path, result, error):
+            self.status_var.set("就绪")
+            if error is not None:
+                messagebox.showerror("错误", str(error))
+                return
+        
+            link_type, target, target_exists = result
+            self.result_text.delete(1.0, tk.END)
+        
+            if link_type:
+                lines = [f"路径: {path}", f"类型: {link_type}"]
+                if target:
+                    lines += [f"目标: {target}", f"目标存在: {'是' if target_exists else '否'}"]
+                self.result_text.insert(tk.END, "\n".join(lines) + "\n")
+            else:
+                self.result_text.insert(tk.END, f"路径 {path} 不是链接")
     
-    # 应用设置
-    def apply_settings(self):
-        if self.integrate_var.get():
-            self.integrate_to_context_menu()
-        else:
-            self.remove_from_context_menu()
+        # 检查是否已集成到右键菜单
+        def check_integration(self):
+            if self._integration_cache is not None:
+                return self._integration_cache
+        
+            try:
+                with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, "*\\shell\\PythonLinkShell", 0, winreg.KEY_QUERY_VALUE):
+                    self._integration_cache = True
+            except:
+                self._integration_cache = False
+            return self._integration_cache
+    
+        # 应用设置
+        def apply_settings(self):
+            if self.integrate_var.get():
+                self.integrate_to_context_menu()
+            else:
+                self.remove_from_context_menu()
     
-    # 集成到右键菜单
-    def integrate_to_context_menu(self):
-        if not is_admin():
-            run_as_admin()
-            return
+        # 集成到右键菜单
+        def integrate_to_context_menu(self):
+            if not is_admin():
+                self._request_admin()
+                return
         
-        try:
-            # 为文件添加右键菜单
-            key = winreg.CreateKey(winreg.HKEY_CLASSES_ROOT, "*\\shell\\PythonLinkShell")
-            winreg.SetValueEx(key, "", 0, winreg.REG_SZ, "Python Link Shell")
-            winreg.SetValueEx(key, "Icon", 0, winreg.REG_SZ, sys.executable)
-            winreg.CloseKey(key)
-            
-            key = winreg.CreateKey(winreg.HKEY_CLASSES_ROOT, "*\\shell\\PythonLinkShell\\command")
-            winreg.SetValueEx(key, "", 0, winreg.REG_SZ, f'"{sys.executable}" "{os.path.abspath(__file__)}" --source "%1"')
-            winreg.CloseKey(key)
-            
-            # 为目录添加右键菜单
-            key = winreg.CreateKey(winreg.HKEY_CLASSES_ROOT, "Directory\\shell\\PythonLinkShell")
-            winreg.SetValueEx(key, "", 0, winreg.REG_SZ, "Python Link Shell")
-            winreg.SetValueEx(key, "Icon", 0, winreg.REG_SZ, sys.executable)
-            winreg.CloseKey(key)
-            
-            key = winreg.CreateKey(winreg.HKEY_CLASSES_ROOT, "Directory\\shell\\PythonLinkShell\\command")
-            winreg.SetValueEx(key, "", 0, winreg.REG_SZ, f'"{sys.executable}" "{os.path.abspath(__file__)}" --source "%1"')
-            winreg.CloseKey(key)
-            
-            messagebox.showinfo("成功", "已成功集成到右键菜单")
-        except Exception as e:
-            messagebox.showerror("错误", f"集成到右键菜单失败: {str(e)}")
+            self._run_in_background(self.apply_button, self._integrate_worker, self._render_integrate_result)
     
-    # 从右键菜单移除
-    def remove_from_context_menu(self):
-        if not is_admin():
-            run_as_admin()
-            return
+        def _integrate_worker(self):
+            command = f'"{sys.executable}" "{_SCRIPT_PATH}" --source "%1"'
+        
+            # 为文件和目录添加右键菜单，所有写入在同一事务中提交
+            _write_registry_keys(winreg.HKEY_CLASSES_ROOT, [
+                ("*\\shell\\PythonLinkShell",
+                 {"": "Python Link Shell", "Icon": sys.executable}),
+                ("*\\shell\\PythonLinkShell\\command",
+                 {"": command}),
+                ("Directory\\shell\\PythonLinkShell",
+                 {"": "Python Link Shell", "Icon": sys.executable}),
+                ("Directory\\shell\\PythonLinkShell\\command",
+                 {"": command}),
+            ])
+    
+        def _render_integrate_result(self, result, error):
+            if error is None:
+                self._integration_cache = True
+                messagebox.showinfo("成功", "已成功集成到右键菜单")
+            else:
+                messagebox.showerror("错误", f"集成到右键菜单失败: {str(error)}")
+    
+        # 从右键菜单移除
+        def remove_from_context_menu(self):
+            if not is_admin():
+                self._request_admin()
+                return
         
-        try:
-            # 删除文件右键菜单
-            winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, "*\\shell\\PythonLinkShell\\command")
-            winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, "*\\shell\\PythonLinkShell")
-            
-            # 删除目录右键菜单
-            winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, "Directory\\shell\\PythonLinkShell\\command")
-            winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, "Directory\\shell\\PythonLinkShell")
-            
-            messagebox.showinfo("成功", "已从右键菜单移除")
-        except Exception as e:
-            messagebox.showerror("错误", f"从右键菜单移除失败: {str(e)}")
+            self._run_in_background(self.apply_button, self._remove_worker, self._render_remove_result)
+    
+        def _remove_worker(self):
+            # 删除文件和目录右键菜单，所有删除在同一事务中提交
+            _delete_registry_keys(winreg.HKEY_CLASSES_ROOT, [
+                "*\\shell\\PythonLinkShell\\command",
+                "*\\shell\\PythonLinkShell",
+                "Directory\\shell\\PythonLinkShell\\command",
+                "Directory\\shell\\PythonLinkShell",
+            ])
+    
+        def _render_remove_result(self, result, error):
+            if error is None:
+                self._integration_cache = False
+                messagebox.showinfo("成功", "已从右键菜单移除")
+            else:
+                messagebox.showerror("错误", f"从右键菜单移除失败: {str(error)}")
+    
+    app = LinkShellApp()
+    if prefill:
+        app.source_path.set(prefill)
+    app.mainloop()
 
 # 命令行参数处理
 def parse_arguments():
@@ -458,41 +864,19 @@ def parse_arguments():
 def main():
     args = parse_arguments()
     
-    # 如果提供了命令行参数，则使用命令行模式
-    if args.source:
-        # 如果只提供了源路径，则启动GUI并预填充源路径
-        if not args.type or not args.target:
-            app = LinkShellApp()
-            app.source_path.set(args.source)
-            app.mainloop()
-        else:
-            # 完整的命令行参数，直接创建链接
-            if args.type == "hardlink":
-                if create_hardlink(args.source, args.target):
-                    print(f"成功创建硬链接: {args.target}")
-                else:
-                    print("创建硬链接失败")
-            elif args.type == "symlink":
-                is_dir = os.path.isdir(args.source)
-                if create_symlink(args.source, args.target, is_dir):
-                    print(f"成功创建符号链接: {args.target}")
-                else:
-                    print("创建符号链接失败")
-            elif args.type == "junction":
-                if create_junction(args.source, args.target):
-                    print(f"成功创建目录联接: {args.target}")
-                else:
-                    print("创建目录联接失败")
-    # 检查是否有直接指定的文件路径
-    elif args.files:
-        # 启动GUI并预填充第一个文件路径
-        app = LinkShellApp()
-        app.source_path.set(args.files[0])
-        app.mainloop()
-    else:
-        # 无命令行参数，启动GUI
-        app = LinkShellApp()
-        app.mainloop()
+    # 完整的命令行参数，直接创建链接，不加载图形界面
+    if args.source and args.type and args.target:
+        name = LINK_TYPE_NAMES[args.type]
+        try:
+            create_link_by_type(args.type, args.source, args.target)
+        except Exception as e:
+            print(f"创建{name}失败: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        print(f"成功创建{name}: {args.target}")
+        return
+    
+    # 启动GUI，并预填充源路径或第一个直接指定的文件路径
+    _launch_gui(args.source or (args.files[0] if args.files else None))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file